@@ -1,9 +1,10 @@
+import argparse
 import pandas as pd
 from transformers import pipeline
 import torch
 from transformers import pipeline
 import time
-from utils import SENTIMENT_MAP, SENTIMENT_MAP_STARS, SENTIMENT_MAP_SCORE, SENTIMENT_MAP_STARS_SCORE, SENTIMENT_MODEL_NAMES
+from utils import CSV_CHUNK_SIZE, SENTIMENT_MAP, SENTIMENT_MAP_STARS, SENTIMENT_MAP_SCORE, SENTIMENT_MAP_STARS_SCORE, SENTIMENT_MODEL_NAMES
 
 def analyze_sentiment(input_df, english_sentiment_pipeline, multilingual_sentiment_pipeline, verbose=False):
     """
@@ -78,12 +79,47 @@ def analyze_sentiment(input_df, english_sentiment_pipeline, multilingual_sentime
     print(f"Sentiment analysis completed in {end_time - start_time:.2f} seconds")
     return df
 
-def main():
+def analyze_sentiment_chunked(input_filename, output_filename, english_sentiment_pipeline, multilingual_sentiment_pipeline, chunk_size=CSV_CHUNK_SIZE, verbose=False):
+    """
+    Stream the comment file in chunks of chunk_size rows, perform the sentiment analysis on each chunk
+    and append the results to the output file, so that the memory usage is bounded by the chunk size
+
+    Args:
+        input_filename (str): The comment file to analyze
+        output_filename (str): The file to write the results to
+        english_sentiment_pipeline (transformers.pipeline): The pipeline for English comments
+        multilingual_sentiment_pipeline (transformers.pipeline): The pipeline for multilingual comments
+        chunk_size (int): The number of comments per chunk
+
+    Returns:
+        int: The number of comments written to the output file, or None if errors occur
+    """
+    total_comments = 0
+    with open(output_filename, 'w', newline='', encoding='utf-8-sig') as output_file:
+        for chunk_index, chunk in enumerate(pd.read_csv(input_filename, chunksize=chunk_size)):
+            print(f"Processing chunk {chunk_index + 1} ({len(chunk)} comments)")
+            df_results = analyze_sentiment(chunk, english_sentiment_pipeline=english_sentiment_pipeline, multilingual_sentiment_pipeline=multilingual_sentiment_pipeline, verbose=verbose)
+            if df_results is None:
+                return None
+            df_results.to_csv(output_file, index=False, header=(total_comments == 0))
+            total_comments += len(df_results)
+    return total_comments
+
+def main(chunk_size=None):
     search_query = "Mozart Violin Sonata in E minor"
     input_filename = f"{search_query.replace(' ', '_')}_comments_results.csv"
     output_filename = f"{search_query.replace(' ', '_')}_comments_results_with_sentiment.csv"
     english_sentiment_pipeline = pipeline("text-classification", model=SENTIMENT_MODEL_NAMES[2], device=0 if torch.cuda.is_available() else -1)
     multilingual_sentiment_pipeline = pipeline("text-classification", model=SENTIMENT_MODEL_NAMES[1], device=0 if torch.cuda.is_available() else -1)
+    if chunk_size:
+        try:
+            total_comments = analyze_sentiment_chunked(input_filename, output_filename, english_sentiment_pipeline=english_sentiment_pipeline, multilingual_sentiment_pipeline=multilingual_sentiment_pipeline, chunk_size=chunk_size)
+        except FileNotFoundError:
+            print(f"Error: No documents found in {input_filename}")
+            return None
+        if total_comments is not None:
+            print(f"\nResults of {total_comments} comments saved to {output_filename}")
+        return None
     try:
         input_df = pd.read_csv(input_filename)
         print(f"Loaded {len(input_df)} comments from {input_filename} successfully")
@@ -100,4 +136,16 @@ def main():
         print(f"\nResults saved to {output_filename}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Perform the sentiment analysis on the comments"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        nargs="?",
+        const=CSV_CHUNK_SIZE,
+        default=None,
+        help=f"Stream the comment file in chunks of this many rows (default {CSV_CHUNK_SIZE} when given without a value) and append the results incrementally"
+    )
+    args = parser.parse_args()
+    main(chunk_size=args.chunk_size)
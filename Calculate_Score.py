@@ -1,5 +1,8 @@
+import argparse
 import pandas as pd
+import numpy as np
 import math
+from utils import CSV_CHUNK_SIZE
 
 def calculate_total_and_divergence_score(group):
     """
@@ -82,12 +85,99 @@ def get_video_scores(df):
         return None
     return df_results
 
-def main():
+def get_partial_video_aggregates(df):
+    """
+    Get the per-video partial aggregates of a chunk of comments.
+    The aggregates are additive, so the ones of several chunks can be combined with combine_video_aggregates
+
+    Args:
+        df (pandas.DataFrame): A chunk of comments with sentiment results
+
+    Returns:
+        pandas.DataFrame: The partial aggregates indexed by video_id
+    """
+    weighted_sentiment_score = df["sentiment_label"] * df["sentiment_score"] * df["like_count"]
+    chunk = pd.DataFrame({
+        "video_id": df["video_id"],
+        "sentiment_score": df["sentiment_score"],
+        "sentiment_score_squared": df["sentiment_score"] ** 2,
+        "relevance_score": df["relevance_score"],
+        "positive_weighted_score": weighted_sentiment_score.where(df["sentiment_label"] == 1, 0),
+        "negative_weighted_score": weighted_sentiment_score.where(df["sentiment_label"] == -1, 0)
+    })
+    grouped = chunk.groupby("video_id")
+    return pd.DataFrame({
+        "comment_count": grouped.size(),
+        "sentiment_count": grouped["sentiment_score"].count(),
+        "sentiment_sum": grouped["sentiment_score"].sum(),
+        "sentiment_sum_of_squares": grouped["sentiment_score_squared"].sum(),
+        "relevance_count": grouped["relevance_score"].count(),
+        "relevance_sum": grouped["relevance_score"].sum(),
+        "positive_weighted_sum": grouped["positive_weighted_score"].sum(),
+        "negative_weighted_sum": grouped["negative_weighted_score"].sum()
+    })
+
+def combine_video_aggregates(aggregates):
+    """
+    Combine the per-video partial aggregates of several chunks into one
+    """
+    return pd.concat(aggregates).groupby(level=0).sum()
+
+def get_video_scores_from_aggregates(aggregates):
+    """
+    Get the scores of the videos from the combined per-video aggregates,
+    giving the same results as get_video_scores on the whole comment file
+    """
+    if aggregates.empty:
+        print("No data to calculate scores.")
+        return None
+    relevance_score = aggregates["relevance_sum"] / aggregates["relevance_count"].replace(0, np.nan)
+    n = aggregates["sentiment_count"]
+    # Sample variance (ddof=1) from the sum and the sum of squares
+    variance = (aggregates["sentiment_sum_of_squares"] - aggregates["sentiment_sum"] ** 2 / n.replace(0, np.nan)) / (n - 1).where(n > 1, np.nan)
+    std_deviation = np.sqrt(variance.clip(lower=0))
+    positive_sum = aggregates["positive_weighted_sum"].abs()
+    negative_sum = aggregates["negative_weighted_sum"].abs()
+    absolute_sum = positive_sum + negative_sum
+    polarization_score = (4 * positive_sum * negative_sum / absolute_sum ** 2).where(absolute_sum != 0, 0)
+    polarization_score_with_pseudo_count = aggregates["comment_count"] / (aggregates["comment_count"] + 5) * polarization_score
+    df_results = pd.DataFrame({
+        "total_score": aggregates["sentiment_sum"] * relevance_score,
+        "relevance_score": relevance_score,
+        "std_deviation": std_deviation * np.sqrt(relevance_score),
+        "polarization_score_with_pseudo_count": polarization_score_with_pseudo_count * np.sqrt(relevance_score)
+    })
+    df_results.index.name = "video_id"
+    return df_results.reset_index()
+
+def get_video_scores_chunked(input_filename, chunk_size=CSV_CHUNK_SIZE):
+    """
+    Get the scores of the videos by streaming the comment file in chunks of chunk_size rows,
+    so that the memory usage is bounded by the chunk size rather than the size of the file
+    """
+    aggregates = None
+    total_comments = 0
+    for chunk in pd.read_csv(input_filename, chunksize=chunk_size):
+        total_comments += len(chunk)
+        partial_aggregates = get_partial_video_aggregates(chunk)
+        aggregates = partial_aggregates if aggregates is None else combine_video_aggregates([aggregates, partial_aggregates])
+    print(f"Aggregated {total_comments} comments from {input_filename}")
+    if aggregates is None:
+        print("No data to calculate scores.")
+        return None
+    return get_video_scores_from_aggregates(aggregates)
+
+def main(chunk_size=None):
     search_query = "Mozart Violin Sonata in E minor"
     input_filename = f"{search_query.replace(' ', '_')}_comments_results_with_sentiment.csv"
     output_filename = f"{search_query.replace(' ', '_')}_comments_results_with_final_scores.csv"
-    df = pd.read_csv(input_filename)
-    df_results = get_video_scores(df)
+    if chunk_size:
+        df_results = get_video_scores_chunked(input_filename, chunk_size=chunk_size)
+    else:
+        df = pd.read_csv(input_filename)
+        df_results = get_video_scores(df)
+    if df_results is None:
+        return None
     print("\nPreview of the results:")
     print(df_results.head())
     df_results.to_csv(output_filename, index=False, encoding='utf-8-sig')
@@ -96,6 +186,18 @@ def main():
     print(f"Best video ID: {best_video_id}, Best score: {best_score}, Most polarized video ID: {most_polarized_video_id}, Most polarized polarization score: {most_polarized_polarization_score}, Most polarized std deviation: {most_polarized_std_deviation}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Calculate the scores of the videos from the comments with sentiment results"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        nargs="?",
+        const=CSV_CHUNK_SIZE,
+        default=None,
+        help=f"Stream the comment file in chunks of this many rows (default {CSV_CHUNK_SIZE} when given without a value) instead of loading it into memory"
+    )
+    args = parser.parse_args()
+    main(chunk_size=args.chunk_size)
 
     
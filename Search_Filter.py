@@ -4,18 +4,23 @@ import pandas as pd
 
 
 
-def get_comments(video_id, youtube, num_comments=100):
+COMMENTS_BATCH_SIZE = 50
+
+def _build_comments_request(video_id, youtube, num_comments=100):
     """
-    Get the comments for a video.
+    Build (without executing) the request for the comments of a video.
     """
-    comments = []
-
-    comments_request = youtube.commentThreads().list(
+    return youtube.commentThreads().list(
         part="id, snippet",
         videoId=video_id,
         maxResults=num_comments
     )
-    comments_response = comments_request.execute()
+
+def _parse_comments_response(comments_response):
+    """
+    Extract the comments from a commentThreads().list response.
+    """
+    comments = []
     for comment in comments_response.get("items", []):
         top_level_comment = comment.get("snippet", {}).get("topLevelComment", {})
         comment_snippet = top_level_comment.get("snippet", {})
@@ -28,6 +33,49 @@ def get_comments(video_id, youtube, num_comments=100):
         })
     return comments
 
+def get_comments(video_id, youtube, num_comments=100):
+    """
+    Get the comments for a video.
+    """
+    comments_response = _build_comments_request(video_id, youtube, num_comments=num_comments).execute()
+    return _parse_comments_response(comments_response)
+
+def get_comments_batch(video_ids, youtube, num_comments=100, batch_size=COMMENTS_BATCH_SIZE):
+    """
+    Get the comments for several videos, grouping the requests into HTTP batch requests
+    so that one round-trip carries up to batch_size videos.
+
+    Args:
+        video_ids (list): The ids of the videos
+        youtube: The YouTube API client
+        num_comments (int): The maximum number of comments to fetch per video
+        batch_size (int): The maximum number of requests per batch
+
+    Returns:
+        dict: video_id -> list of comments, or the HttpError raised for that video
+    """
+    results = {}
+
+    def store_response(request_id, response, exception):
+        if exception is not None:
+            results[request_id] = exception
+        else:
+            results[request_id] = _parse_comments_response(response)
+
+    unique_video_ids = list(dict.fromkeys(video_ids))
+    for start in range(0, len(unique_video_ids), batch_size):
+        chunk = unique_video_ids[start:start + batch_size]
+        batch = youtube.new_batch_http_request(callback=store_response)
+        for video_id in chunk:
+            batch.add(_build_comments_request(video_id, youtube, num_comments=num_comments), request_id=video_id)
+        try:
+            batch.execute()
+        except HttpError as e:
+            # The whole batch failed, report the error for every video that got no response
+            for video_id in chunk:
+                results.setdefault(video_id, e)
+    return results
+
 def search_and_filter(search_query, youtube, num_candidates=50, min_duration_in_seconds=None, verbose=False):
     """
     Search for videos on YouTube and filter them based on the search query.
@@ -95,21 +143,28 @@ def search_and_filter(search_query, youtube, num_candidates=50, min_duration_in_
             "comment_count": statistics.get('commentCount', 'N/A'),
             "relevance_score": relevance_score
         })
-        # Fetch the comments
-        try:
+
+    # Fetch the comments of all the remaining videos in batched requests
+    if verbose:
+        print(f"--- Fetching the first 100 comments for {len(video_general_results)} videos ---")
+    comments_by_video = get_comments_batch([video["video_id"] for video in video_general_results], youtube=youtube)
+
+    for video in video_general_results:
+        video_id = video["video_id"]
+        video_title = video["title"]
+        relevance_score = video["relevance_score"]
+        comments = comments_by_video.get(video_id, [])
+        if isinstance(comments, HttpError):
             if verbose:
-                print(f"Fetching the first 100 comments for {snippet.get('title', 'N/A')}")
-            comments = get_comments(video_id, youtube=youtube)
+                print(f"Error fetching comments for {video_title}: {comments}")
+                if comments.resp.status == 403:
+                    print(f"Error Details: Maybe the comments of the video are turned off")
+            comments = []
+        else:
             if comments:
                 video_with_comments += 1
             if verbose:
-                print(f"Fetched {len(comments)} comments for {snippet.get('title', 'N/A')}")
-        except HttpError as e:
-            if verbose:
-                print(f"Error fetching comments for {snippet.get('title', 'N/A')}: {e}")
-                if e.resp.status == 403:
-                    print(f"Error Details: Maybe the comments of the video are turned off")
-            comments = []
+                print(f"Fetched {len(comments)} comments for {video_title}")
         for comment in comments:
             clean_text = preprocess_text(comment["text"])
             language = detect_language(clean_text)
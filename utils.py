@@ -3,6 +3,7 @@ import os
 import dotenv
 import pandas as pd
 from googleapiclient.discovery import build
+import httplib2
 from bs4 import BeautifulSoup
 import html
 from langdetect import detect, LangDetectException
@@ -29,6 +30,10 @@ EXCLUDE_WORDS = ["tutorial",
             "how to learn"
 ]
 
+HTTP_TIMEOUT_SECONDS = 30
+
+CSV_CHUNK_SIZE = 10000
+
 SENTIMENT_MODEL_NAMES = [
         "nlptown/bert-base-multilingual-uncased-sentiment",
         "tabularisai/multilingual-sentiment-analysis",
@@ -70,6 +75,8 @@ SENTIMENT_MAP_STARS_SCORE = {
 def initialize_youtube_api(api_key=None):
     """
     Initialize the YouTube API.
+    The client is built from the discovery document bundled with google-api-python-client,
+    so no discovery request is made at startup, and all requests share one keep-alive HTTP transport.
     """
     if api_key is None:
         dotenv.load_dotenv()
@@ -78,7 +85,8 @@ def initialize_youtube_api(api_key=None):
         api_key = api_key
     if not api_key:
         raise ValueError("YOUTUBE_API_KEY is not set in the environment variables")
-    youtube = build("youtube", "v3", developerKey=api_key)
+    http = httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+    youtube = build("youtube", "v3", developerKey=api_key, http=http, static_discovery=True, cache_discovery=False)
     print(f"YouTube API initialized successfully")
     return youtube
 